@@ -7,7 +7,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['openpyxl', 'click'],
+    hiddenimports=['openpyxl', 'click', 'numpy', 'python_calamine', 'xlsxwriter'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,10 +1,35 @@
 """Command-line interface for exceldiff."""
 
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 import click
 from exceldiff.excel_reader import ExcelReader
-from exceldiff.differ import WorksheetDiffer
+from exceldiff.differ import WorksheetDiffer, DiffType
 from exceldiff.writer import ExcelDiffWriter
+from exceldiff.xlsxwriter_writer import XlsxWriterDiffWriter
+
+
+def _load_sheet(reader: ExcelReader, file_path: str, sheet_name: Optional[str]) -> Tuple[str, List[Tuple[Any, ...]]]:
+    """
+    Read a worksheet, opening the file only once.
+
+    Args:
+        reader: Reader to use
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet to read (None for first sheet)
+
+    Returns:
+        Tuple of (name of the sheet read, list of rows)
+    """
+    workbook = reader.open(file_path)
+    try:
+        if sheet_name is None:
+            sheet_name = reader.get_sheet_names(workbook)[0]
+        return sheet_name, reader.read(workbook, sheet_name)
+    finally:
+        workbook.close()
 
 
 @click.command()
@@ -40,7 +65,20 @@ from exceldiff.writer import ExcelDiffWriter
     default=False,
     help='Do not include header row when using --diff-only'
 )
-def main(file1: str, file2: str, output: str, sheet1: str, sheet2: str, diff_only: bool, no_header: bool):
+@click.option(
+    '--no-comments',
+    is_flag=True,
+    default=False,
+    help='Do not add a comment with the old and new value to modified cells'
+)
+@click.option(
+    '--calamine',
+    is_flag=True,
+    default=False,
+    help='Read files with python-calamine (faster; error cells such as #DIV/0! read as empty)'
+)
+def main(file1: str, file2: str, output: str, sheet1: str, sheet2: str, diff_only: bool, no_header: bool,
+         no_comments: bool, calamine: bool):
     """
     Compare two Excel worksheets and output differences to a new file.
 
@@ -54,7 +92,11 @@ def main(file1: str, file2: str, output: str, sheet1: str, sheet2: str, diff_onl
       - Orange row: Row added in FILE2
     """
     try:
-        reader = ExcelReader()
+        if calamine and not ExcelReader.is_calamine_available():
+            click.echo("Error: --calamine requires python-calamine to be installed", err=True)
+            sys.exit(1)
+
+        reader = ExcelReader(use_calamine=calamine)
 
         # Validate file formats
         if not reader.supports(file1):
@@ -65,23 +107,19 @@ def main(file1: str, file2: str, output: str, sheet1: str, sheet2: str, diff_onl
             click.echo(f"Error: {file2} is not a .xlsx file", err=True)
             sys.exit(1)
 
-        # Show available sheets if needed
-        if sheet1 is None:
-            sheets = reader.get_sheet_names(file1)
-            click.echo(f"Reading first sheet from {file1}: '{sheets[0]}'")
+        # Read both files concurrently; output stays on the main thread
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            load1 = executor.submit(_load_sheet, reader, file1, sheet1)
+            load2 = executor.submit(_load_sheet, reader, file2, sheet2)
 
-        if sheet2 is None:
-            sheets = reader.get_sheet_names(file2)
-            click.echo(f"Reading first sheet from {file2}: '{sheets[0]}'")
+            # Read worksheets
+            click.echo(f"Reading {file1}...")
+            sheet1, data1 = load1.result()
+            click.echo(f"  Loaded {len(data1)} rows from sheet '{sheet1}'")
 
-        # Read worksheets
-        click.echo(f"\nReading {file1}...")
-        data1 = reader.read(file1, sheet1)
-        click.echo(f"  Loaded {len(data1)} rows")
-
-        click.echo(f"Reading {file2}...")
-        data2 = reader.read(file2, sheet2)
-        click.echo(f"  Loaded {len(data2)} rows")
+            click.echo(f"Reading {file2}...")
+            sheet2, data2 = load2.result()
+            click.echo(f"  Loaded {len(data2)} rows from sheet '{sheet2}'")
 
         # Perform diff
         click.echo("\nComparing worksheets...")
@@ -89,29 +127,23 @@ def main(file1: str, file2: str, output: str, sheet1: str, sheet2: str, diff_onl
         diffs = differ.compare(data1, data2)
 
         # Count diff types
-        stats = {
-            'identical': 0,
-            'modified': 0,
-            'removed': 0,
-            'added': 0
-        }
-
-        for diff in diffs:
-            stats[diff.diff_type.value] += 1
+        stats = Counter(diff.diff_type for diff in diffs)
 
         click.echo(f"\nDiff Summary:")
-        click.echo(f"  Identical rows: {stats['identical']}")
-        click.echo(f"  Modified rows:  {stats['modified']}")
-        click.echo(f"  Removed rows:   {stats['removed']}")
-        click.echo(f"  Added rows:     {stats['added']}")
+        click.echo(f"  Identical rows: {stats[DiffType.IDENTICAL]}")
+        click.echo(f"  Modified rows:  {stats[DiffType.MODIFIED]}")
+        click.echo(f"  Removed rows:   {stats[DiffType.REMOVED]}")
+        click.echo(f"  Added rows:     {stats[DiffType.ADDED]}")
 
         # Write output
         click.echo(f"\nWriting diff to {output}...")
-        writer = ExcelDiffWriter()
-        writer.write(diffs, output, diff_only=diff_only, include_header=(diff_only and not no_header))
+        # XlsxWriter streams large outputs faster; openpyxl is always available
+        writer = XlsxWriterDiffWriter() if XlsxWriterDiffWriter.is_available() else ExcelDiffWriter()
+        writer.write(diffs, output, diff_only=diff_only, include_header=(diff_only and not no_header),
+                     comments=not no_comments)
 
         if diff_only:
-            output_rows = sum(1 for d in diffs if d.diff_type.value != 'identical')
+            output_rows = len(diffs) - stats[DiffType.IDENTICAL]
             if not no_header and len(diffs) > 0:
                 output_rows += 1  # Include header in count
             click.echo(f"\nDone! Diff written to {output} ({output_rows} rows)")
@@ -1,7 +1,43 @@
 """Diff engine for comparing worksheets."""
 
-from typing import List, Any, Dict, Tuple
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Any, Dict, Optional, Sequence, Tuple
 from enum import Enum
+import numpy as np
+
+@lru_cache(maxsize=None)
+def _numba_kernel():
+    """
+    Compile the numba kernel that scores numeric candidate rows.
+
+    numba takes a noticeable time to import, so it is only loaded once a
+    sheet is large enough to need it.
+
+    Returns:
+        The kernel, or None if numba is not installed
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        # numba is optional; numeric sheets are then scored with NumPy like any other
+        return None
+
+    @njit(parallel=True, cache=True)
+    def _score_numeric_rows(target, sheet, candidates):
+        """Count matching cells between target and each candidate row; NaN marks an empty cell."""
+        scores = np.empty(len(candidates), dtype=np.int64)
+        for i in prange(len(candidates)):
+            row = sheet[candidates[i]]
+            count = 0
+            for col_idx in range(target.shape[0]):
+                if target[col_idx] == row[col_idx] or (np.isnan(target[col_idx]) and np.isnan(row[col_idx])):
+                    count += 1
+            scores[i] = count
+        return scores
+
+    return _score_numeric_rows
 
 
 class DiffType(Enum):
@@ -15,6 +51,9 @@ class DiffType(Enum):
 class RowDiff:
     """Represents the diff information for a single row."""
 
+    # One instance is created per row; slots avoid a __dict__ on each of them
+    __slots__ = ('row_index', 'diff_type', 'row_data', 'modified_cells', 'original_row_data')
+
     def __init__(self, row_index: int, diff_type: DiffType, row_data: List[Any],
                  modified_cells: List[int] = None, original_row_data: List[Any] = None):
         """
@@ -37,7 +76,15 @@ class RowDiff:
 class WorksheetDiffer:
     """Engine for comparing two worksheets."""
 
-    def compare(self, sheet1: List[List[Any]], sheet2: List[List[Any]]) -> List[RowDiff]:
+    # Minimum number of cell comparisons (leftover rows x sheet2 rows x columns)
+    # before the numba kernel is worth its compilation time
+    NUMBA_MIN_CELLS = 10_000_000
+
+    # Share of rows that must match by position (identical or modified in
+    # place) for compare to skip the sequence alignment
+    ALIGNED_RATIO = 0.95
+
+    def compare(self, sheet1: List[Sequence[Any]], sheet2: List[Sequence[Any]]) -> List[RowDiff]:
         """
         Compare two worksheets and generate diff information.
 
@@ -48,8 +95,6 @@ class WorksheetDiffer:
         Returns:
             List of RowDiff objects describing the differences
         """
-        result = []
-
         # Normalize rows to handle different column counts
         max_cols = max(
             max((len(row) for row in sheet1), default=0),
@@ -59,58 +104,233 @@ class WorksheetDiffer:
         sheet1_normalized = [self._normalize_row(row, max_cols) for row in sheet1]
         sheet2_normalized = [self._normalize_row(row, max_cols) for row in sheet2]
 
-        # Create mapping of rows for comparison
-        sheet1_map = {self._row_to_key(row): idx for idx, row in enumerate(sheet1_normalized)}
-        sheet2_map = {self._row_to_key(row): idx for idx, row in enumerate(sheet2_normalized)}
+        # Normalize cell values once; the keys are reused for every comparison
+        sheet1_keys = [self._row_to_key(row) for row in sheet1_normalized]
+        sheet2_keys = [self._row_to_key(row) for row in sheet2_normalized]
 
-        processed_sheet1 = set()
-        processed_sheet2 = set()
+        # Tuples do not cache their hash, so give every distinct row an int id
+        # once; all later lookups and row comparisons only touch ints
+        key_ids = {}
+        sheet1_ids = [key_ids.setdefault(key, len(key_ids)) for key in sheet1_keys]
+        sheet2_ids = [key_ids.setdefault(key, len(key_ids)) for key in sheet2_keys]
 
-        # First pass: find identical and modified rows
+        # Create mapping of rows for comparison
+        sheet2_map = dict(zip(sheet2_ids, range(len(sheet2_ids))))
+
+        row_diffs = [None] * len(sheet1_normalized)
+        # Bitmap of sheet2 rows already matched (1 = processed)
+        processed_sheet2 = bytearray(len(sheet2_keys))
+
+        # Used by both pairings to tell moved rows from rows edited in place
+        sheet1_id_set = set(sheet1_ids)
+
+        # First phase: pair up identical and replaced rows. Nearly aligned sheets
+        # are paired by position; the sequence alignment is only run otherwise.
+        paired = self._pair_by_position(sheet1_keys, sheet2_keys, sheet1_ids, sheet2_ids, sheet2_map,
+                                        sheet1_id_set, max_cols, sheet1_normalized, row_diffs, processed_sheet2)
+        if paired is None:
+            paired = self._pair_by_alignment(sheet1_keys, sheet2_keys, sheet1_ids, sheet2_ids, sheet2_map,
+                                             sheet1_id_set, max_cols, sheet1_normalized, row_diffs, processed_sheet2)
+        pairs1, pairs2, equal = paired
+        similar = self._similar_rows(equal, max_cols)
+
+        for pair_idx in similar:
+            idx1 = pairs1[pair_idx]
+            idx2 = pairs2[pair_idx]
+            modified_cells = np.flatnonzero(~equal[pair_idx]).tolist()
+            row_diffs[idx1] = RowDiff(idx1, DiffType.MODIFIED, sheet2_normalized[idx2],
+                                      modified_cells, sheet1_normalized[idx1])
+            processed_sheet2[idx2] = 1
+
+        # Second phase: match the leftover rows anywhere in sheet2, so moved
+        # rows are still found. Exact matches are claimed before fuzzy ones,
+        # and each copy of a repeated row claims the next unmatched copy.
+        unmatched_copies = {}
+        for idx2 in range(len(sheet2_ids) - 1, -1, -1):
+            if not processed_sheet2[idx2]:
+                unmatched_copies.setdefault(sheet2_ids[idx2], []).append(idx2)
+
+        leftover = []
         for idx1, row1 in enumerate(sheet1_normalized):
-            key1 = self._row_to_key(row1)
+            if row_diffs[idx1] is not None:
+                continue
+
+            copies = unmatched_copies.get(sheet1_ids[idx1])
+            idx2 = copies.pop() if copies else sheet2_map.get(sheet1_ids[idx1])
 
-            if key1 in sheet2_map:
+            if idx2 is not None:
                 # Row exists in both sheets (identical)
-                idx2 = sheet2_map[key1]
-                result.append(RowDiff(idx1, DiffType.IDENTICAL, row1))
-                processed_sheet1.add(idx1)
-                processed_sheet2.add(idx2)
+                row_diffs[idx1] = RowDiff(idx1, DiffType.IDENTICAL, row1)
+                processed_sheet2[idx2] = 1
+            else:
+                leftover.append(idx1)
+
+        if leftover:
+            # Inverted index of sheet2: column -> normalized value -> row indices
+            col_index = self._build_column_index(sheet2_keys, max_cols)
+
+            # Purely numeric sheets can be scored in native code by numba
+            numeric = (
+                len(leftover) * len(sheet2_keys) * max_cols >= self.NUMBA_MIN_CELLS
+                and self._is_numeric(sheet2_keys)
+                and self._is_numeric(sheet1_keys[idx1] for idx1 in leftover)
+                and _numba_kernel() is not None
+            )
+            sheet2_array = self._keys_to_array(sheet2_keys, max_cols, numeric)
+
+        for idx1 in leftover:
+            row1 = sheet1_normalized[idx1]
+
+            # Check if this row has a modified version in sheet2
+            match_idx, modified_cells = self._find_modified_row(
+                sheet1_keys[idx1], sheet2_array, col_index, processed_sheet2
+            )
+
+            if match_idx is not None:
+                # Found a modified version
+                row_diffs[idx1] = RowDiff(idx1, DiffType.MODIFIED, sheet2_normalized[match_idx], modified_cells, row1)
+                processed_sheet2[match_idx] = 1
             else:
-                # Check if this row has a modified version in sheet2
-                match_idx, modified_cells = self._find_modified_row(row1, sheet2_normalized, processed_sheet2)
-
-                if match_idx is not None:
-                    # Found a modified version
-                    result.append(RowDiff(idx1, DiffType.MODIFIED, sheet2_normalized[match_idx], modified_cells, row1))
-                    processed_sheet1.add(idx1)
-                    processed_sheet2.add(match_idx)
-                else:
-                    # Row removed in sheet2
-                    result.append(RowDiff(idx1, DiffType.REMOVED, row1))
-                    processed_sheet1.add(idx1)
-
-        # Second pass: find added rows (in sheet2 but not in sheet1)
+                # Row removed in sheet2
+                row_diffs[idx1] = RowDiff(idx1, DiffType.REMOVED, row1)
+
+        result = row_diffs
+
+        # Find added rows (in sheet2 but not in sheet1)
         for idx2, row2 in enumerate(sheet2_normalized):
-            if idx2 not in processed_sheet2:
+            if not processed_sheet2[idx2]:
                 result.append(RowDiff(len(result), DiffType.ADDED, row2))
 
         return result
 
-    def _normalize_row(self, row: List[Any], target_length: int) -> List[Any]:
+    def _pair_by_position(self, sheet1_keys: List[Tuple], sheet2_keys: List[Tuple], sheet1_ids: List[int],
+                          sheet2_ids: List[int], sheet2_map: Dict[int, int], sheet1_id_set: set, max_cols: int,
+                          sheet1_normalized: List[Sequence[Any]], row_diffs: List[Optional[RowDiff]],
+                          processed_sheet2: bytearray) -> Optional[Tuple[List[int], List[int], np.ndarray]]:
+        """
+        Pair rows by position when nearly all rows kept their position.
+
+        This covers cells edited in place and rows appended or dropped at the end.
+        Identical rows are recorded in row_diffs and processed_sheet2.
+
+        Args:
+            sheet1_keys: Normalized row keys of sheet1
+            sheet2_keys: Normalized row keys of sheet2
+            sheet1_ids: Row ids of sheet1
+            sheet2_ids: Row ids of sheet2
+            sheet2_map: Row id -> last index of that row in sheet2
+            sheet1_id_set: Row ids present in sheet1
+            max_cols: Number of columns in each row
+            sheet1_normalized: Normalized rows of sheet1
+            row_diffs: Diff of each sheet1 row, None while unmatched
+            processed_sheet2: Bitmap of sheet2 rows already matched
+
+        Returns:
+            Tuple of (sheet1 indices, sheet2 indices, equal matrix) for the changed
+            row pairs, or None if the sheets are not aligned
+        """
+        common = min(len(sheet1_ids), len(sheet2_ids))
+        unchanged = []
+        changed = []
+        for idx in range(common):
+            if sheet1_ids[idx] == sheet2_ids[idx]:
+                unchanged.append(idx)
+            else:
+                changed.append(idx)
+
+        # Rows that exist unchanged elsewhere were moved, not edited in place
+        changed = [
+            idx for idx in changed
+            if sheet1_ids[idx] not in sheet2_map and sheet2_ids[idx] not in sheet1_id_set
+        ]
+
+        # Skip comparing cells when the sheets cannot pass even if every changed pair is similar
+        if not common or len(unchanged) + len(changed) <= self.ALIGNED_RATIO * common:
+            return None
+
+        equal = self._equal_matrix([sheet1_keys[idx] for idx in changed],
+                                   [sheet2_keys[idx] for idx in changed], max_cols)
+        if len(unchanged) + len(self._similar_rows(equal, max_cols)) <= self.ALIGNED_RATIO * common:
+            return None
+
+        for idx in unchanged:
+            row_diffs[idx] = RowDiff(idx, DiffType.IDENTICAL, sheet1_normalized[idx])
+            processed_sheet2[idx] = 1
+
+        return changed, changed, equal
+
+    def _pair_by_alignment(self, sheet1_keys: List[Tuple], sheet2_keys: List[Tuple], sheet1_ids: List[int],
+                           sheet2_ids: List[int], sheet2_map: Dict[int, int], sheet1_id_set: set, max_cols: int,
+                           sheet1_normalized: List[Sequence[Any]], row_diffs: List[Optional[RowDiff]],
+                           processed_sheet2: bytearray) -> Tuple[List[int], List[int], np.ndarray]:
+        """
+        Pair rows by aligning both sheets as sequences of rows.
+
+        Unchanged runs are identical and recorded in row_diffs and processed_sheet2;
+        rows replaced in place are paired up position by position. Repeated rows
+        (mostly blank ones) make the alignment quadratic, so only rows occurring at
+        most once in each sheet are aligned; the repeated ones are left to the
+        second phase of compare().
+
+        Args:
+            sheet1_keys: Normalized row keys of sheet1
+            sheet2_keys: Normalized row keys of sheet2
+            sheet1_ids: Row ids of sheet1
+            sheet2_ids: Row ids of sheet2
+            sheet2_map: Row id -> last index of that row in sheet2
+            sheet1_id_set: Row ids present in sheet1
+            max_cols: Number of columns in each row
+            sheet1_normalized: Normalized rows of sheet1
+            row_diffs: Diff of each sheet1 row, None while unmatched
+            processed_sheet2: Bitmap of sheet2 rows already matched
+
+        Returns:
+            Tuple of (sheet1 indices, sheet2 indices, equal matrix) for the replaced row pairs
+        """
+        counts1 = Counter(sheet1_ids)
+        counts2 = Counter(sheet2_ids)
+        anchors1 = [idx for idx, row_id in enumerate(sheet1_ids) if counts1[row_id] == 1 and counts2[row_id] <= 1]
+        anchors2 = [idx for idx, row_id in enumerate(sheet2_ids) if counts2[row_id] == 1 and counts1[row_id] <= 1]
+
+        matcher = SequenceMatcher(None, [sheet1_ids[idx] for idx in anchors1],
+                                  [sheet2_ids[idx] for idx in anchors2], autojunk=False)
+        pairs1 = []
+        pairs2 = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for idx1, idx2 in zip(anchors1[i1:i2], anchors2[j1:j2]):
+                    row_diffs[idx1] = RowDiff(idx1, DiffType.IDENTICAL, sheet1_normalized[idx1])
+                    processed_sheet2[idx2] = 1
+            elif tag == 'replace':
+                # As in _pair_by_position, rows that exist unchanged elsewhere
+                # were moved, not edited in place
+                for idx1, idx2 in zip(anchors1[i1:i2], anchors2[j1:j2]):
+                    if sheet1_ids[idx1] not in sheet2_map and sheet2_ids[idx2] not in sheet1_id_set:
+                        pairs1.append(idx1)
+                        pairs2.append(idx2)
+
+        # Compare all replaced pairs at once, one column at a time
+        equal = self._equal_matrix([sheet1_keys[idx1] for idx1 in pairs1],
+                                   [sheet2_keys[idx2] for idx2 in pairs2], max_cols)
+        return pairs1, pairs2, equal
+
+    def _normalize_row(self, row: Sequence[Any], target_length: int) -> Sequence[Any]:
         """
         Normalize a row to a target length by padding with None.
 
         Args:
-            row: The row to normalize
+            row: The row to normalize, as a list or tuple
             target_length: Desired length
 
         Returns:
-            Normalized row
+            Normalized row, of the same type as the input
         """
         if len(row) >= target_length:
             return row[:target_length]
-        return row + [None] * (target_length - len(row))
+        padding = target_length - len(row)
+        if isinstance(row, tuple):
+            return row + (None,) * padding
+        return row + [None] * padding
 
     def _row_to_key(self, row: List[Any]) -> Tuple:
         """
@@ -122,7 +342,7 @@ class WorksheetDiffer:
         Returns:
             Tuple representation of the row
         """
-        return tuple(self._normalize_value(v) for v in row)
+        return tuple(map(self._normalize_value, row))
 
     def _normalize_value(self, value: Any) -> Any:
         """
@@ -134,53 +354,201 @@ class WorksheetDiffer:
         Returns:
             Normalized value
         """
-        if value is None:
-            return None
-        if isinstance(value, float):
+        # Exact type checks first: most cells are None, int or str and need no work
+        value_type = type(value)
+        if value is None or value_type is int or value_type is str:
+            return value
+        if value_type is float or isinstance(value, float):
             # Handle floating point comparison
             return round(value, 10)
         return value
 
-    def _find_modified_row(self, target_row: List[Any], sheet: List[List[Any]],
-                          processed: set) -> Tuple[int, List[int]]:
+    def _equal_matrix(self, keys1: List[Tuple], keys2: List[Tuple], num_cols: int) -> np.ndarray:
         """
-        Find a row that matches the target row with some modifications.
+        Compare rows pairwise, keys1[k] against keys2[k], cell by cell.
+
+        The rows are transposed into one array per column so each column is
+        compared with a single vectorized operation.
 
         Args:
-            target_row: Row to find a match for
-            sheet: Sheet to search in
-            processed: Set of already processed row indices
+            keys1: Normalized keys of the first rows
+            keys2: Normalized keys of the rows to compare them with
+            num_cols: Number of columns in each key
 
         Returns:
-            Tuple of (row_index, list of modified cell indices) or (None, None)
+            Boolean array of shape (len(keys1), num_cols), True where the cells are equal
         """
-        # Simple heuristic: if more than 50% of cells match, consider it a modified row
-        best_match = None
-        best_score = 0
-        best_modified = []
+        equal = np.empty((len(keys1), num_cols), dtype=bool)
+        if not keys1:
+            return equal
 
-        for idx, row in enumerate(sheet):
-            if idx in processed:
-                continue
+        for col_idx, (values1, values2) in enumerate(zip(zip(*keys1), zip(*keys2))):
+            column1 = np.array(values1, dtype=object)
+            column2 = np.array(values2, dtype=object)
+
+            numeric1 = self._to_numeric_column(column1)
+            numeric2 = self._to_numeric_column(column2) if numeric1 is not None else None
+
+            if numeric2 is not None:
+                # NaN only stands for empty cells here, so NaN == NaN
+                equal[:, col_idx] = (numeric1 == numeric2) | (np.isnan(numeric1) & np.isnan(numeric2))
+            else:
+                equal[:, col_idx] = column1 == column2
+
+        return equal
 
-            matches = 0
-            modified = []
+    def _similar_rows(self, equal: np.ndarray, num_cols: int) -> np.ndarray:
+        """
+        Find the row pairs similar enough to count as a modification.
+
+        Args:
+            equal: Equality matrix, as returned by _equal_matrix
+            num_cols: Number of columns in each row
+
+        Returns:
+            Indices of the pairs where at least 50% of cells match
+        """
+        if not num_cols:
+            return np.empty(0, dtype=np.intp)
+
+        # Simple heuristic: if at least 50% of cells match, consider it a modified row
+        return np.flatnonzero(equal.sum(axis=1) * 2 >= num_cols)
+
+    def _to_numeric_column(self, column: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Convert an object column to float64 if that loses no information.
+
+        Args:
+            column: Column of normalized cell values
 
-            for col_idx, (v1, v2) in enumerate(zip(target_row, row)):
-                if self._normalize_value(v1) == self._normalize_value(v2):
-                    matches += 1
-                else:
-                    modified.append(col_idx)
+        Returns:
+            float64 array with NaN for empty cells, or None if the column holds other values
+        """
+        try:
+            numeric = column.astype(np.float64)
+        except (TypeError, ValueError, OverflowError):
+            return None
 
-            score = matches / len(target_row) if target_row else 0
+        # Reject values that only look numeric after conversion ("1.5", NaN, huge ints)
+        empty = column == None  # noqa: E711 - elementwise comparison
+        if not np.all((numeric == column) | empty):
+            return None
+
+        return numeric
 
-            # Require at least 50% match to consider it a modification
-            if score > best_score and score >= 0.5:
-                best_score = score
-                best_match = idx
-                best_modified = modified
+    def _build_column_index(self, keys: List[Tuple], num_cols: int) -> List[Dict[Any, List[int]]]:
+        """
+        Build an inverted index from cell values to the rows containing them.
+
+        Args:
+            keys: Normalized row keys to index
+            num_cols: Number of columns in each key
+
+        Returns:
+            List with, per column, a dict mapping each value to the row indices holding it
+        """
+        col_index = [{} for _ in range(num_cols)]
+        for idx, key in enumerate(keys):
+            for col_idx, value in enumerate(key):
+                col_index[col_idx].setdefault(value, []).append(idx)
+        return col_index
 
-        if best_match is not None:
-            return best_match, best_modified
+    def _is_numeric(self, keys) -> bool:
+        """
+        Check whether rows only hold numbers that are exact as float64, or empty cells.
+
+        Args:
+            keys: Normalized row keys
+
+        Returns:
+            True if every cell is None, a non-NaN float or an int within float64 precision
+        """
+        for key in keys:
+            for value in key:
+                value_type = type(value)
+                if value is None:
+                    continue
+                if value_type is float and value == value:
+                    continue
+                if value_type is int and -2 ** 53 <= value <= 2 ** 53:
+                    continue
+                return False
+        return True
+
+    def _keys_to_array(self, keys: List[Tuple], num_cols: int, numeric: bool = False) -> np.ndarray:
+        """
+        Convert normalized row keys to a 2-D array.
+
+        Args:
+            keys: Normalized row keys
+            num_cols: Number of columns in each key
+            numeric: If True, build a float64 array with NaN for empty cells
+                (keys must pass _is_numeric); otherwise an object array
+
+        Returns:
+            Array of shape (len(keys), num_cols)
+        """
+        if numeric:
+            array = np.empty((len(keys), num_cols), dtype=np.float64)
+            for idx, key in enumerate(keys):
+                array[idx] = [np.nan if value is None else value for value in key]
+            return array
+
+        array = np.empty((len(keys), num_cols), dtype=object)
+        if keys:
+            array[:] = keys
+        return array
+
+    def _find_modified_row(self, target_key: Tuple, sheet: np.ndarray,
+                          col_index: List[Dict[Any, List[int]]], processed: bytearray) -> Tuple[int, List[int]]:
+        """
+        Find a row that matches the target row with some modifications.
+
+        Args:
+            target_key: Normalized key of the row to find a match for
+            sheet: Normalized sheet to search in, as built by _keys_to_array (object or numeric)
+            col_index: Inverted index of the sheet, as built by _build_column_index
+            processed: Bitmap of already processed row indices
+
+        Returns:
+            Tuple of (row_index, list of modified cell indices) or (None, None)
+        """
+        if not target_key:
+            return None, None
+
+        # Only unprocessed rows sharing at least one cell value can reach the threshold
+        buckets = [col_index[col_idx].get(value) for col_idx, value in enumerate(target_key)]
+        buckets = [bucket for bucket in buckets if bucket]
+        if not buckets:
+            return None, None
+
+        # Mark candidates in a bitmap rather than deduplicating index lists; the
+        # processed bytearray is viewed as a boolean mask without copying
+        is_candidate = np.zeros(len(processed), dtype=bool)
+        for bucket in buckets:
+            is_candidate[bucket] = True
+        is_candidate &= ~np.frombuffer(processed, dtype=bool)
+
+        candidates = np.flatnonzero(is_candidate)
+        if not len(candidates):
+            return None, None
+
+        # Compare all candidates at once; candidates are sorted, so ties go to the earliest row
+        if sheet.dtype == object:
+            matches = sheet[candidates] == np.array(target_key, dtype=object)
+            scores = matches.sum(axis=1)
+        else:
+            target = np.array([np.nan if value is None else value for value in target_key], dtype=np.float64)
+            scores = _numba_kernel()(target, sheet, candidates)
+        best = scores.argmax()
+
+        # Simple heuristic: if at least 50% of cells match, consider it a modified row
+        if scores[best] / len(target_key) >= 0.5:
+            if sheet.dtype == object:
+                equal = matches[best]
+            else:
+                row = sheet[candidates[best]]
+                equal = (row == target) | (np.isnan(row) & np.isnan(target))
+            return int(candidates[best]), np.flatnonzero(~equal).tolist()
 
         return None, None
@@ -1,63 +1,192 @@
 """Excel file reader implementation."""
 
+import datetime
 import os
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Tuple, Union
 from openpyxl import load_workbook
 from exceldiff.reader import FileReader
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    # python-calamine is optional; openpyxl's read-only mode is always available
+    CalamineWorkbook = None
+
 
 class ExcelReader(FileReader):
     """Reader for Excel (.xlsx) files."""
 
-    def read(self, file_path: str, sheet_name: Optional[str] = None) -> List[List[Any]]:
+    def __init__(self, use_calamine: bool = False):
         """
-        Read a worksheet from an Excel file.
+        Initialize the reader.
+
+        Args:
+            use_calamine: If True, read with python-calamine instead of openpyxl. It is
+                much faster on large files, but error cells such as #DIV/0! read as
+                empty because calamine does not expose error values.
+        """
+        if use_calamine and not self.is_calamine_available():
+            raise ValueError("python-calamine is not installed")
+        self.use_calamine = use_calamine
+
+    @staticmethod
+    def is_calamine_available() -> bool:
+        """
+        Check if python-calamine is installed.
+
+        Returns:
+            True if the reader can be created with use_calamine=True
+        """
+        return CalamineWorkbook is not None
+
+    def open(self, file_path: str) -> Any:
+        """
+        Open an Excel file once so several sheets or sheet names can be read from it.
 
         Args:
             file_path: Path to the Excel file
-            sheet_name: Name of the sheet to read (None for first sheet)
 
         Returns:
-            List of rows, where each row is a list of cell values
+            Workbook handle to pass to read() and get_sheet_names(); the caller must close() it
         """
         if not self.supports(file_path):
             raise ValueError(f"File {file_path} is not a valid .xlsx file")
 
-        workbook = load_workbook(filename=file_path, data_only=True)
+        if self.use_calamine:
+            return CalamineWorkbook.from_path(file_path)
+        return load_workbook(filename=file_path, read_only=True, data_only=True)
+
+    def read(self, file_path: Union[str, Any], sheet_name: Optional[str] = None) -> List[Tuple[Any, ...]]:
+        """
+        Read a worksheet from an Excel file.
+
+        Args:
+            file_path: Path to the Excel file, or a workbook returned by open()
+            sheet_name: Name of the sheet to read (None for first sheet)
+
+        Returns:
+            List of rows, where each row is a tuple of cell values
+        """
+        if isinstance(file_path, (str, os.PathLike)):
+            workbook = self.open(file_path)
+            try:
+                return self.read(workbook, sheet_name)
+            finally:
+                workbook.close()
+
+        if CalamineWorkbook is not None and isinstance(file_path, CalamineWorkbook):
+            rows = self._read_calamine(file_path, sheet_name)
+        else:
+            rows = self._read_openpyxl(file_path, sheet_name)
+
+        # openpyxl also reports formatted but empty rows at the end of a sheet,
+        # calamine does not; drop them so both backends return the same rows
+        while rows and all(value is None for value in rows[-1]):
+            rows.pop()
+
+        return rows
+
+    def _read_calamine(self, workbook: Any, sheet_name: Optional[str]) -> List[Tuple[Any, ...]]:
+        """
+        Read a worksheet from a python-calamine workbook.
+
+        Args:
+            workbook: Open CalamineWorkbook
+            sheet_name: Name of the sheet to read (None for first sheet)
 
+        Returns:
+            List of rows, where each row is a tuple of cell values
+        """
+        if sheet_name:
+            self._check_sheet_name(sheet_name, workbook.sheet_names)
+            worksheet = workbook.get_sheet_by_name(sheet_name)
+        else:
+            worksheet = workbook.get_sheet_by_index(0)
+
+        return [
+            tuple(map(self._convert_calamine_value, row))
+            for row in worksheet.to_python(skip_empty_area=False)
+        ]
+
+    def _convert_calamine_value(self, value: Any) -> Any:
+        """
+        Convert a python-calamine cell value to the value openpyxl would return.
+
+        Calamine reports empty cells as "", every number as a float and date-only
+        cells as dates, while openpyxl (and the rest of exceldiff) use None, int
+        for whole numbers and datetime. Error cells are also reported as "" and
+        cannot be told apart from empty ones, so they read as None.
+
+        Args:
+            value: Cell value from calamine
+
+        Returns:
+            Converted cell value
+        """
+        if value == "":
+            return None
+        if type(value) is float and value.is_integer() and -2 ** 53 <= value <= 2 ** 53:
+            return int(value)
+        if type(value) is datetime.date:
+            return datetime.datetime.combine(value, datetime.time())
+        return value
+
+    def _read_openpyxl(self, workbook: Any, sheet_name: Optional[str]) -> List[Tuple[Any, ...]]:
+        """
+        Read a worksheet from an openpyxl workbook opened in read-only mode.
+
+        Args:
+            workbook: Open openpyxl Workbook
+            sheet_name: Name of the sheet to read (None for first sheet)
+
+        Returns:
+            List of rows, where each row is a tuple of cell values
+        """
         if sheet_name:
-            if sheet_name not in workbook.sheetnames:
-                raise ValueError(
-                    f"Sheet '{sheet_name}' not found. Available sheets: {', '.join(workbook.sheetnames)}"
-                )
+            self._check_sheet_name(sheet_name, workbook.sheetnames)
             worksheet = workbook[sheet_name]
         else:
-            worksheet = workbook.active
+            worksheet = workbook.worksheets[0]
 
-        rows = []
-        for row in worksheet.iter_rows(values_only=True):
-            rows.append(list(row))
+        # Rows already come as tuples; keep them instead of copying each into a list
+        return list(worksheet.iter_rows(values_only=True))
 
-        workbook.close()
-        return rows
+    def _check_sheet_name(self, sheet_name: str, sheet_names: List[str]) -> None:
+        """
+        Ensure a sheet exists in the workbook.
 
-    def get_sheet_names(self, file_path: str) -> List[str]:
+        Args:
+            sheet_name: Name of the requested sheet
+            sheet_names: Names of the sheets in the workbook
+
+        Raises:
+            ValueError: If the sheet does not exist
+        """
+        if sheet_name not in sheet_names:
+            raise ValueError(
+                f"Sheet '{sheet_name}' not found. Available sheets: {', '.join(sheet_names)}"
+            )
+
+    def get_sheet_names(self, file_path: Union[str, Any]) -> List[str]:
         """
         Get list of sheet names in the Excel file.
 
         Args:
-            file_path: Path to the Excel file
+            file_path: Path to the Excel file, or a workbook returned by open()
 
         Returns:
             List of sheet names
         """
-        if not self.supports(file_path):
-            raise ValueError(f"File {file_path} is not a valid .xlsx file")
-
-        workbook = load_workbook(filename=file_path, read_only=True)
-        sheet_names = workbook.sheetnames
-        workbook.close()
-        return sheet_names
+        if isinstance(file_path, (str, os.PathLike)):
+            workbook = self.open(file_path)
+            try:
+                return self.get_sheet_names(workbook)
+            finally:
+                workbook.close()
+
+        if CalamineWorkbook is not None and isinstance(file_path, CalamineWorkbook):
+            return list(file_path.sheet_names)
+        return file_path.sheetnames
 
     def supports(self, file_path: str) -> bool:
         """
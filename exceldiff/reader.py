@@ -1,14 +1,14 @@
 """File reader interface and implementations."""
 
 from abc import ABC, abstractmethod
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Sequence
 
 
 class FileReader(ABC):
     """Abstract base class for file readers."""
 
     @abstractmethod
-    def read(self, file_path: str, sheet_name: Optional[str] = None) -> List[List[Any]]:
+    def read(self, file_path: str, sheet_name: Optional[str] = None) -> List[Sequence[Any]]:
         """
         Read a worksheet from a file.
 
@@ -17,7 +17,7 @@ class FileReader(ABC):
             sheet_name: Name of the sheet to read (None for first sheet)
 
         Returns:
-            List of rows, where each row is a list of cell values
+            List of rows, where each row is a sequence of cell values
         """
         pass
 
@@ -1,9 +1,12 @@
 """Excel writer with color formatting for diffs."""
 
-from typing import List
+from itertools import islice
+from typing import Any, Iterator, List, Optional, Tuple
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.styles import PatternFill, Font
 from openpyxl.comments import Comment
+from openpyxl.utils import get_column_letter
 from exceldiff.differ import RowDiff, DiffType
 
 
@@ -16,7 +19,20 @@ class ExcelDiffWriter:
     COLOR_REMOVED = "FFFF00"   # Yellow for removed rows
     COLOR_ADDED = "FFA500"     # Orange for added rows
 
-    def write(self, diffs: List[RowDiff], output_path: str, diff_only: bool = False, include_header: bool = False) -> None:
+    # Shared style objects, created once rather than for every cell
+    FONT_MODIFIED = Font(color=COLOR_MODIFIED)
+    FILL_REMOVED = PatternFill(start_color=COLOR_REMOVED, end_color=COLOR_REMOVED, fill_type="solid")
+    FILL_ADDED = PatternFill(start_color=COLOR_ADDED, end_color=COLOR_ADDED, fill_type="solid")
+
+    # Author shown on change comments
+    COMMENT_AUTHOR = "ExcelDiff"
+
+    # Number of leading rows used to estimate column widths; later rows rarely
+    # change the result and measuring every cell is expensive on large diffs
+    WIDTH_SAMPLE_ROWS = 200
+
+    def write(self, diffs: List[RowDiff], output_path: str, diff_only: bool = False, include_header: bool = False,
+              comments: bool = True) -> None:
         """
         Write diff results to an Excel file with color highlighting.
 
@@ -25,6 +41,7 @@ class ExcelDiffWriter:
             output_path: Path to write the output file
             diff_only: If True, only write rows with differences (exclude identical rows)
             include_header: If True, include the first row as header (only applies when diff_only=True)
+            comments: If True, attach a comment with the old and new value to every modified cell
 
         Color scheme:
         - Identical rows: No coloring
@@ -32,10 +49,41 @@ class ExcelDiffWriter:
         - Removed rows: Yellow background for entire row
         - Added rows: Orange background for entire row
         """
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = "Diff"
+        # Write-only mode streams rows to disk instead of keeping every cell in memory
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet("Diff")
+
+        header_row, diffs_to_write = self._select_rows(diffs, diff_only, include_header)
+        rows = self._iter_rows(worksheet, header_row, diffs_to_write, comments)
+
+        # Column widths must be set before the first row is streamed, so
+        # estimate them from the leading rows only
+        sample = list(islice(rows, self.WIDTH_SAMPLE_ROWS))
+        widths = self._column_widths([[self._cell_value(cell) for cell in cells] for cells in sample])
+        for col_idx, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = width
+
+        for cells in sample:
+            worksheet.append(cells)
+        for cells in rows:
+            worksheet.append(cells)
+
+        # Save the workbook
+        workbook.save(output_path)
+
+    def _select_rows(self, diffs: List[RowDiff], diff_only: bool,
+                     include_header: bool) -> Tuple[Optional[RowDiff], List[RowDiff]]:
+        """
+        Select the rows to write.
+
+        Args:
+            diffs: List of RowDiff objects
+            diff_only: If True, exclude identical rows
+            include_header: If True, write the first row as header
 
+        Returns:
+            Tuple of (header row or None, RowDiff objects to write)
+        """
         # Filter diffs if needed
         diffs_to_write = [d for d in diffs if not diff_only or d.diff_type != DiffType.IDENTICAL]
 
@@ -45,79 +93,127 @@ class ExcelDiffWriter:
             # First row is assumed to be the header
             header_row = diffs[0]
 
-        # Write header if needed
-        row_idx = 1
+        return header_row, diffs_to_write
+
+    def _change_text(self, diff: RowDiff, cell_idx: int) -> Optional[Tuple[str, str]]:
+        """
+        Get the old and new value of a modified cell as text.
+
+        Args:
+            diff: The RowDiff the cell belongs to
+            cell_idx: Column index of the cell
+
+        Returns:
+            Tuple of (old text, new text), or None if the cell is not modified
+        """
+        if diff.diff_type != DiffType.MODIFIED or cell_idx not in diff.modified_cells or not diff.original_row_data:
+            return None
+
+        old_value = diff.original_row_data[cell_idx] if cell_idx < len(diff.original_row_data) else None
+        new_value = diff.row_data[cell_idx]
+
+        old_str = str(old_value) if old_value is not None else ""
+        new_str = str(new_value) if new_value is not None else ""
+        return old_str, new_str
+
+    def _iter_rows(self, worksheet, header_row: Optional[RowDiff],
+                   diffs: List[RowDiff], comments: bool) -> Iterator[List[Any]]:
+        """
+        Generate the cells of every output row.
+
+        Args:
+            worksheet: Write-only worksheet the cells belong to
+            header_row: Row to write unformatted before the diffs, if any
+            diffs: RowDiff objects to write
+            comments: Whether to attach change comments to modified cells
+
+        Yields:
+            List of plain values and formatted cells for each output row
+        """
         if header_row:
-            for col_idx, value in enumerate(header_row.row_data, start=1):
-                cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-            row_idx += 1
-
-        # Write all rows with appropriate formatting
-        for diff in diffs_to_write:
-            # Write row data
-            for col_idx, value in enumerate(diff.row_data, start=1):
-                cell_idx = col_idx - 1
-
-                # Apply formatting based on diff type
-                if diff.diff_type == DiffType.IDENTICAL:
-                    # No coloring for identical rows
-                    cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-
-                elif diff.diff_type == DiffType.MODIFIED:
-                    # For modified cells, show both old and new values
-                    if cell_idx in diff.modified_cells and diff.original_row_data:
-                        old_value = diff.original_row_data[cell_idx] if cell_idx < len(diff.original_row_data) else None
-                        new_value = value
-
-                        # Write cell with old and new values as plain text
-                        cell = worksheet.cell(row=row_idx, column=col_idx)
-                        old_str = str(old_value) if old_value is not None else ""
-                        new_str = str(new_value) if new_value is not None else ""
-                        cell.value = f"{old_str} → {new_str}"
-
-                        # Apply red font color to indicate change
-                        cell.font = Font(color=self.COLOR_MODIFIED)
-
-                        # Add comment to show what changed
-                        cell.comment = Comment(f"Changed from: {old_str}\nTo: {new_str}", "ExcelDiff")
-                    else:
-                        # Cell not modified, just write the value
-                        cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-
-                elif diff.diff_type == DiffType.REMOVED:
-                    # Color entire row yellow
-                    cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-                    cell.fill = PatternFill(
-                        start_color=self.COLOR_REMOVED,
-                        end_color=self.COLOR_REMOVED,
-                        fill_type="solid"
-                    )
-
-                elif diff.diff_type == DiffType.ADDED:
-                    # Color entire row orange
-                    cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-                    cell.fill = PatternFill(
-                        start_color=self.COLOR_ADDED,
-                        end_color=self.COLOR_ADDED,
-                        fill_type="solid"
-                    )
-
-            row_idx += 1
-
-        # Auto-adjust column widths for better readability
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+            yield header_row.row_data
 
-        # Save the workbook
-        workbook.save(output_path)
+        for diff in diffs:
+            yield self._build_row(worksheet, diff, comments)
+
+    def _build_row(self, worksheet, diff: RowDiff, comments: bool) -> List[Any]:
+        """
+        Build the cells for a single diff row.
+
+        Only cells that carry formatting are wrapped in a WriteOnlyCell; the
+        rest stay plain values, which append() writes without building a Cell.
+
+        Args:
+            worksheet: Write-only worksheet the cells belong to
+            diff: The RowDiff to render
+            comments: Whether to attach change comments to modified cells
+
+        Returns:
+            List of values and cells for the row
+        """
+        if diff.diff_type in (DiffType.REMOVED, DiffType.ADDED):
+            # Color entire row yellow (removed) or orange (added)
+            fill = self.FILL_REMOVED if diff.diff_type == DiffType.REMOVED else self.FILL_ADDED
+            cells = []
+            for value in diff.row_data:
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.fill = fill
+                cells.append(cell)
+            return cells
+
+        if diff.diff_type != DiffType.MODIFIED:
+            # Identical rows are written as they are
+            return diff.row_data
+
+        cells = list(diff.row_data)
+
+        # For modified rows, only the changed cells need formatting
+        for cell_idx in diff.modified_cells:
+            change = self._change_text(diff, cell_idx)
+            if change:
+                # Write cell with old and new values as plain text
+                old_str, new_str = change
+                cell = WriteOnlyCell(worksheet, value=f"{old_str} → {new_str}")
+
+                # Apply red font color to indicate change
+                cell.font = self.FONT_MODIFIED
+
+                # Add comment to show what changed
+                if comments:
+                    cell.comment = Comment(f"Changed from: {old_str}\nTo: {new_str}", self.COMMENT_AUTHOR)
+
+                cells[cell_idx] = cell
+
+        return cells
+
+    @staticmethod
+    def _cell_value(cell: Any) -> Any:
+        """
+        Get the value of an output cell, which is either a plain value or a Cell.
+
+        Args:
+            cell: Plain value or formatted cell
+
+        Returns:
+            The cell value
+        """
+        return cell.value if isinstance(cell, Cell) else cell
+
+    def _column_widths(self, rows: List[List[Any]]) -> List[int]:
+        """
+        Auto-adjust column widths for better readability.
+
+        Args:
+            rows: Rows of cell values to base the widths on
+
+        Returns:
+            Width of each column
+        """
+        max_lengths = [0] * max((len(values) for values in rows), default=0)
+
+        for values in rows:
+            for col_idx, value in enumerate(values):
+                if value is not None:
+                    max_lengths[col_idx] = max(max_lengths[col_idx], len(str(value)))
+
+        return [min(max_length + 2, 50) for max_length in max_lengths]
@@ -0,0 +1,165 @@
+"""Excel writer backed by XlsxWriter for fast streaming of large diffs."""
+
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from exceldiff.differ import RowDiff, DiffType
+from exceldiff.writer import ExcelDiffWriter
+
+try:
+    import xlsxwriter
+except ImportError:
+    # XlsxWriter is optional; the CLI falls back to ExcelDiffWriter
+    xlsxwriter = None
+
+
+class XlsxWriterDiffWriter(ExcelDiffWriter):
+    """Writer for creating Excel files with diff highlighting using XlsxWriter."""
+
+    # Number formats applied to dates and times, matching openpyxl's defaults
+    DATE_FORMATS = {
+        datetime.datetime: "yyyy-mm-dd h:mm:ss",
+        datetime.date: "yyyy-mm-dd",
+        datetime.time: "h:mm:ss",
+        datetime.timedelta: "[hh]:mm:ss",
+    }
+
+    # Format properties for each highlight style
+    STYLE_PROPERTIES = {
+        DiffType.MODIFIED: {"font_color": f"#{ExcelDiffWriter.COLOR_MODIFIED}"},
+        DiffType.REMOVED: {"bg_color": f"#{ExcelDiffWriter.COLOR_REMOVED}", "pattern": 1},
+        DiffType.ADDED: {"bg_color": f"#{ExcelDiffWriter.COLOR_ADDED}", "pattern": 1},
+    }
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Check if XlsxWriter is installed.
+
+        Returns:
+            True if this writer can be used
+        """
+        return xlsxwriter is not None
+
+    def write(self, diffs: List[RowDiff], output_path: str, diff_only: bool = False, include_header: bool = False,
+              comments: bool = True) -> None:
+        """
+        Write diff results to an Excel file with color highlighting.
+
+        Args:
+            diffs: List of RowDiff objects
+            output_path: Path to write the output file
+            diff_only: If True, only write rows with differences (exclude identical rows)
+            include_header: If True, include the first row as header (only applies when diff_only=True)
+            comments: If True, attach a comment with the old and new value to every modified cell
+
+        The color scheme is the same as ExcelDiffWriter's.
+        """
+        # constant_memory flushes every row to disk as soon as the next one starts
+        workbook = xlsxwriter.Workbook(output_path, {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "nan_inf_to_errors": True,
+            "remove_timezone": True,
+        })
+        worksheet = workbook.add_worksheet("Diff")
+
+        # Formats are created once per workbook and shared by all cells
+        formats = {}
+
+        header_row, diffs_to_write = self._select_rows(diffs, diff_only, include_header)
+
+        rows = []
+        if header_row:
+            rows.append((header_row, False))
+        rows.extend((diff, True) for diff in diffs_to_write)
+
+        sample = []
+        for row_idx, (diff, highlight) in enumerate(rows):
+            values = self._write_row(workbook, worksheet, formats, row_idx, diff, highlight, comments)
+            if row_idx < self.WIDTH_SAMPLE_ROWS:
+                sample.append(values)
+
+        for col_idx, width in enumerate(self._column_widths(sample)):
+            worksheet.set_column(col_idx, col_idx, width)
+
+        workbook.close()
+
+    def _write_row(self, workbook, worksheet, formats: Dict[Tuple, Any], row_idx: int,
+                   diff: RowDiff, highlight: bool, comments: bool) -> List[Any]:
+        """
+        Write the cells of a single diff row.
+
+        Args:
+            workbook: XlsxWriter workbook being written
+            worksheet: Worksheet to write to
+            formats: Cache of formats created so far
+            row_idx: Zero-based row index in the worksheet
+            diff: The RowDiff to render
+            highlight: If False, the row is written without formatting (header row)
+            comments: Whether to attach change comments to modified cells
+
+        Returns:
+            The values written, for column width estimation
+        """
+        if not highlight:
+            style = None
+        elif diff.diff_type in (DiffType.REMOVED, DiffType.ADDED):
+            # Color entire row yellow (removed) or orange (added)
+            style = diff.diff_type
+        else:
+            style = None
+
+        values = []
+
+        for col_idx, value in enumerate(diff.row_data):
+            cell_style = style
+            change = self._change_text(diff, col_idx) if highlight else None
+
+            if change:
+                # Show both old and new values in red
+                old_str, new_str = change
+                value = f"{old_str} → {new_str}"
+                cell_style = DiffType.MODIFIED
+
+                # Add comment to show what changed
+                if comments:
+                    worksheet.write_comment(row_idx, col_idx, f"Changed from: {old_str}\nTo: {new_str}",
+                                            {"author": self.COMMENT_AUTHOR})
+
+            cell_format = self._get_format(workbook, formats, cell_style, value)
+            if value is None:
+                # Blank cells are only written when they carry a fill
+                worksheet.write_blank(row_idx, col_idx, None, cell_format)
+            else:
+                worksheet.write(row_idx, col_idx, value, cell_format)
+
+            values.append(value)
+
+        return values
+
+    def _get_format(self, workbook, formats: Dict[Tuple, Any], style: Optional[DiffType], value: Any) -> Any:
+        """
+        Get the shared format for a cell, creating it on first use.
+
+        Args:
+            workbook: XlsxWriter workbook being written
+            formats: Cache of formats created so far
+            style: Highlight style of the cell, or None
+            value: Value of the cell, which decides the number format
+
+        Returns:
+            XlsxWriter Format, or None for unformatted cells
+        """
+        num_format = self.DATE_FORMATS.get(type(value))
+        if style is None and num_format is None:
+            return None
+
+        key = (style, num_format)
+        if key not in formats:
+            properties = dict(self.STYLE_PROPERTIES.get(style, {}))
+            if num_format:
+                properties["num_format"] = num_format
+            formats[key] = workbook.add_format(properties)
+
+        return formats[key]
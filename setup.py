@@ -7,7 +7,13 @@ setup(
     install_requires=[
         "openpyxl>=3.1.2",
         "click>=8.1.7",
+        "numpy>=1.26",
     ],
+    extras_require={
+        "calamine": ["python-calamine>=0.4.0"],
+        "numba": ["numba>=0.59"],
+        "xlsxwriter": ["XlsxWriter>=3.0"],
+    },
     entry_points={
         "console_scripts": [
             "exceldiff=exceldiff.cli:main",
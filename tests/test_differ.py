@@ -0,0 +1,120 @@
+"""Tests for the worksheet diff engine."""
+
+import subprocess
+import sys
+from collections import Counter
+from exceldiff.differ import WorksheetDiffer, DiffType
+
+
+def _count_types(diffs):
+    return Counter(diff.diff_type for diff in diffs)
+
+
+def test_repeated_blank_rows_with_inserted_row():
+    # Half the rows are blank and the insert at the top defeats the positional
+    # fast path; aligning every repeated blank row used to be quadratic
+    rows = [(idx, "x") if idx % 2 else (None, None) for idx in range(40_000)]
+
+    diffs = WorksheetDiffer().compare(rows, [("new", "row")] + rows)
+
+    assert _count_types(diffs) == {DiffType.IDENTICAL: 40_000, DiffType.ADDED: 1}
+    assert diffs[-1].row_data == ("new", "row")
+
+
+def _moved_row_sheets(total_rows):
+    # Sheet2 edits [M, x] to [M, y] in place and appends an exact copy of [M, x]
+    sheet1 = [["A", "a"], ["M", "x"]] + [[idx, "r"] for idx in range(total_rows - 2)]
+    sheet2 = [["A", "a"], ["M", "y"]] + [[idx, "r"] for idx in range(total_rows - 2)] + [["M", "x"]]
+    return sheet1, sheet2
+
+
+def test_moved_row_is_not_paired_as_modified():
+    # 4 rows use the sequence alignment, 100 rows the positional fast path
+    for total_rows in (4, 100):
+        sheet1, sheet2 = _moved_row_sheets(total_rows)
+
+        diffs = WorksheetDiffer().compare(sheet1, sheet2)
+
+        assert diffs[1].diff_type == DiffType.IDENTICAL
+        assert diffs[1].row_data == ["M", "x"]
+        assert [(diff.diff_type, diff.row_data) for diff in diffs if diff.diff_type != DiffType.IDENTICAL] == [
+            (DiffType.ADDED, ["M", "y"])
+        ]
+
+
+def test_int_too_large_for_float64():
+    diffs = WorksheetDiffer().compare([[10 ** 400, "a"], ["x", "y"]], [[1, "a"], ["x", "z"]])
+
+    assert [(diff.diff_type, diff.modified_cells) for diff in diffs] == [
+        (DiffType.MODIFIED, [0]),
+        (DiffType.MODIFIED, [1]),
+    ]
+
+
+def test_numba_is_not_imported_with_the_differ():
+    # numba is slow to import and only needed for very large numeric sheets
+    code = "import sys, exceldiff.differ; sys.exit('numba' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def _edited_sheets(total_rows):
+    # Edit one cell of row 2 and insert a new row before the last one
+    sheet1 = [(idx, f"name{idx}", idx * 1.5) for idx in range(total_rows)]
+    sheet2 = list(sheet1)
+    sheet2[2] = (2, "changed", 3.0)
+    sheet2.insert(total_rows - 1, ("new", "row", None))
+    return sheet1, sheet2
+
+
+def test_fast_path_matches_alignment(monkeypatch):
+    alignments = []
+    pair_by_alignment = WorksheetDiffer._pair_by_alignment
+
+    def spy(self, *args):
+        alignments.append(len(args[0]))
+        return pair_by_alignment(self, *args)
+
+    monkeypatch.setattr(WorksheetDiffer, "_pair_by_alignment", spy)
+
+    results = []
+    for total_rows in (10, 1000):
+        diffs = WorksheetDiffer().compare(*_edited_sheets(total_rows))
+
+        assert _count_types(diffs)[DiffType.IDENTICAL] == total_rows - 1
+        results.append([
+            (diff.diff_type, diff.row_data, diff.modified_cells)
+            for diff in diffs if diff.diff_type != DiffType.IDENTICAL
+        ])
+
+    # Only the short sheet is too misaligned for the positional fast path
+    assert alignments == [10]
+    assert results[0] == results[1] == [
+        (DiffType.MODIFIED, (2, "changed", 3.0), [1]),
+        (DiffType.ADDED, ("new", "row", None), []),
+    ]
+
+
+def test_edit_in_replace_block_is_modified():
+    # The inserted first row shifts every position, so the sheets are aligned
+    sheet1 = [("id", "name", "qty"), (1, "a", 10), (2, "b", 20), (3, "c", 30)]
+    sheet2 = [("new", "x", 0), ("id", "name", "qty"), (1, "a", 10), (2, "b", 25), (3, "c", 30)]
+
+    diffs = WorksheetDiffer().compare(sheet1, sheet2)
+
+    assert [diff.diff_type for diff in diffs] == [
+        DiffType.IDENTICAL, DiffType.IDENTICAL, DiffType.MODIFIED, DiffType.IDENTICAL, DiffType.ADDED,
+    ]
+    assert diffs[2].row_data == (2, "b", 25)
+    assert diffs[2].original_row_data == (2, "b", 20)
+    assert diffs[2].modified_cells == [2]
+    assert diffs[4].row_data == ("new", "x", 0)
+
+
+def test_duplicate_rows_are_not_added():
+    sheet1 = [(1, "a"), (None, None), (None, None), (2, "b"), (2, "b")]
+    sheet2 = [(0, "z"), (1, "a"), (None, None), (None, None), (2, "b"), (2, "b")]
+
+    diffs = WorksheetDiffer().compare(sheet1, sheet2)
+
+    assert _count_types(diffs) == {DiffType.IDENTICAL: 5, DiffType.ADDED: 1}
+    assert diffs[-1].row_data == (0, "z")
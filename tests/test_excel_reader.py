@@ -0,0 +1,41 @@
+"""Tests for the Excel reader."""
+
+import datetime
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+from exceldiff.excel_reader import ExcelReader
+
+
+def test_calamine_matches_openpyxl(tmp_path):
+    pytest.importorskip("python_calamine")
+
+    path = str(tmp_path / "values.xlsx")
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append([datetime.date(2020, 1, 2), datetime.datetime(2020, 1, 2, 3, 4), 3, 2.5, None, "text", "#DIV/0!"])
+    worksheet.append([1, 2])
+    # Formatted but empty cell well below the data
+    worksheet["D10"].fill = PatternFill(fill_type="solid", start_color="FFFF00")
+    workbook.save(path)
+
+    openpyxl_rows = ExcelReader().read(path)
+    calamine_rows = ExcelReader(use_calamine=True).read(path)
+
+    assert len(openpyxl_rows) == len(calamine_rows) == 2
+    assert openpyxl_rows[0][0] == calamine_rows[0][0] == datetime.datetime(2020, 1, 2)
+    assert openpyxl_rows[0][:6] == calamine_rows[0][:6]
+    assert openpyxl_rows[1][:2] == calamine_rows[1][:2]
+
+    # openpyxl keeps error values; calamine cannot tell them from empty cells
+    assert openpyxl_rows[0][6] == "#DIV/0!"
+    assert calamine_rows[0][6] is None
+
+
+def test_openpyxl_is_the_default(tmp_path):
+    path = str(tmp_path / "error.xlsx")
+    workbook = Workbook()
+    workbook.active.append(["#REF!", 1])
+    workbook.save(path)
+
+    assert ExcelReader().read(path) == [("#REF!", 1)]
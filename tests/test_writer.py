@@ -0,0 +1,80 @@
+"""Tests for the diff writers."""
+
+import datetime
+import pytest
+from openpyxl import load_workbook
+from exceldiff.differ import WorksheetDiffer
+from exceldiff.writer import ExcelDiffWriter
+from exceldiff.xlsxwriter_writer import XlsxWriterDiffWriter
+
+
+SHEET1 = [
+    ("id", "name", "when"),
+    (1, "a", datetime.datetime(2020, 1, 2)),
+    (2, "b", datetime.datetime(2020, 1, 2, 3, 4)),
+    (3, "c", None),
+]
+
+SHEET2 = [
+    ("id", "name", "when"),
+    (1, "a", datetime.datetime(2020, 1, 2)),
+    (2, "B", datetime.datetime(2020, 1, 2, 3, 4)),
+    (4, "d", datetime.time(1, 2)),
+]
+
+
+def _rgb(color):
+    # The writers differ only in the alpha byte; theme colors mean "no color"
+    if color is None or color.type != "rgb":
+        return None
+    return color.rgb[-6:]
+
+
+def _read_cells(path):
+    worksheet = load_workbook(path).active
+    return [
+        [
+            (
+                cell.value,
+                _rgb(cell.fill.fgColor) if cell.fill.fill_type else None,
+                _rgb(cell.font.color),
+                cell.comment.text if cell.comment else None,
+                cell.number_format,
+            )
+            for cell in row
+        ]
+        for row in worksheet.iter_rows()
+    ]
+
+
+@pytest.mark.parametrize("diff_only, include_header, comments", [
+    (False, False, True),
+    (True, True, True),
+    (True, False, True),
+    (False, False, False),
+])
+def test_xlsxwriter_matches_openpyxl_writer(tmp_path, diff_only, include_header, comments):
+    if not XlsxWriterDiffWriter.is_available():
+        pytest.skip("XlsxWriter is not installed")
+
+    diffs = WorksheetDiffer().compare(SHEET1, SHEET2)
+    openpyxl_path = str(tmp_path / "openpyxl.xlsx")
+    xlsxwriter_path = str(tmp_path / "xlsxwriter.xlsx")
+
+    ExcelDiffWriter().write(diffs, openpyxl_path, diff_only, include_header, comments)
+    XlsxWriterDiffWriter().write(diffs, xlsxwriter_path, diff_only, include_header, comments)
+
+    cells = _read_cells(openpyxl_path)
+    assert cells == _read_cells(xlsxwriter_path)
+
+    # Sanity check the rendering itself, so both writers cannot be wrong together
+    modified = [cell for row in cells for cell in row if cell[2] == "FF0000"]
+    assert [cell[0] for cell in modified] == ["b → B"]
+    assert modified[0][3] == ("Changed from: b\nTo: B" if comments else None)
+    assert [row[0][:2] for row in cells if row[0][1]] == [(3, "FFFF00"), (4, "FFA500")]
+
+    first_row = [cell[0] for cell in cells[0]]
+    if diff_only and not include_header:
+        assert first_row == [2, "b → B", datetime.datetime(2020, 1, 2, 3, 4)]
+    else:
+        assert first_row == ["id", "name", "when"]